@@ -89,7 +89,7 @@ class SecuentialMFilter(object):
         self._idx += points
         aux = self.data[self._idx:]
         aux_time = self.data.times[self._idx:]
-        aux_time -= min(aux_time)
+        aux_time -= aux_time.min()
         idx_max = np.argmin(np.abs(aux_time - self.event_duration))
         self.data_window = TimeSeries(aux[:idx_max],
                                       times=aux_time[:idx_max])
@@ -39,6 +39,7 @@ class Dictionary(object):
         self._t = times
         self._f = frequencies
         self._dict = self.compute_dict(times=times, frequency=frequencies)
+        self._splited = None
 
     def compute_dict(self, times=None, frequency=None):
         """
@@ -60,6 +61,18 @@ class Dictionary(object):
         matrix = self._t.data.reshape(-1, 1) * self._f.data
         return np.exp(2j * np.pi * matrix)
 
+    def rebind(self, times, frequency):
+        """
+        use other TimeSamples and FrequencySamples with the same values
+        as the ones used to create the dictionary, the matrix is kept.
+
+        :param times: TimeSamples with the values of the dictionary times
+        :param frequency: FrequencySamples with the values of the
+                          dictionary frequencies
+        """
+        self._t = times
+        self._f = frequency
+
     @property
     def frequency(self):
         """
@@ -84,9 +97,12 @@ class Dictionary(object):
     @property
     def splited_matrix(self):
         """
-        :return: a split of the dictionary (real elements).
+        :return: a split of the dictionary (real elements), computed
+                 only once since every fit and predict use it.
         """
-        return _split_fourier_dict(self._dict)
+        if self._splited is None:
+            self._splited = _split_fourier_dict(self._dict)
+        return self._splited
 
     @property
     def df(self):
@@ -108,6 +124,7 @@ class Dictionary(object):
         :return:                A tuple with the shape.
         """
         if split_matrix:
-            return self.splited_matrix.shape
+            n_times, n_freqs = self._dict.shape
+            return n_times, 2 * n_freqs
         else:
             return self._dict.shape
@@ -14,10 +14,7 @@ def _cast_into_ft(coefs):
     :return:            the complex coefficients.
     """
     n_freqs = int(len(coefs) / 2)
-    ft = 1j * np.zeros(n_freqs)
-    for i in range(n_freqs):
-        ft[i] = coefs[i] - 1j * coefs[i + n_freqs]
-    return ft
+    return coefs[:n_freqs] - 1j * coefs[n_freqs:2 * n_freqs]
 
 
 def split_ft(ft):
@@ -28,10 +25,12 @@ def split_ft(ft):
     :param ft:          the complex coefficients.
     :return:            the real coefficients.
     """
-    coefs = np.zeros(len(ft)*2)
-    for i in range(len(ft)):
-        coefs[i] = ft[i].real
-        coefs[i + len(ft)] = -ft[i].imag
+    if isinstance(ft, Array):
+        ft = ft.data
+    ft = np.asarray(ft)
+    coefs = np.empty(len(ft)*2)
+    coefs[:len(ft)] = ft.real
+    coefs[len(ft):] = -ft.imag
     return coefs
 
 
@@ -0,0 +1,44 @@
+import numpy as np
+
+from imf.types import Array, TimeSamples, TimeSeries
+
+
+def test_add_point_promotes_dtype():
+    ary = Array(np.arange(3))
+    ary.add_point(2.7)
+    assert ary.dtype == np.float64
+    np.testing.assert_array_equal(ary.data, [0., 1., 2., 2.7])
+
+    ary.add_point(1 + 1j)
+    assert ary.kind == "complex"
+    np.testing.assert_array_equal(ary.data, [0., 1., 2., 2.7, 1 + 1j])
+
+
+def test_add_point_buffer_growth():
+    ary = Array(np.zeros(0))
+    expected = []
+    for point in range(100):
+        ary.add_point(float(point))
+        expected.append(float(point))
+        assert len(ary._buffer) >= len(ary) == len(expected)
+    assert len(ary._buffer) == 128
+    np.testing.assert_array_equal(ary.data, expected)
+
+    # changes done outside add_point are not lost by the next append
+    ary *= 2
+    ary.roll(1)
+    ary.add_point(-1.)
+    expected = np.roll(2 * np.array(expected), 1)
+    np.testing.assert_array_equal(ary.data, np.append(expected, -1.))
+
+
+def test_add_data_keeps_shared_times():
+    times = TimeSamples(n=5, delta=1., struct="regular")
+    first = TimeSeries(np.zeros(5), times=times)
+    second = TimeSeries(np.ones(5), times=times)
+
+    first.add_data(1., 5.)
+    first.add_data(2., 6.)
+    assert len(first) == len(first.times) == 7
+    assert len(second) == len(second.times) == len(times) == 5
+    assert first.times.is_sorted
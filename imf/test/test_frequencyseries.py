@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from imf.types import Array, FrequencySamples
+
+try:
+    from astropy.timeseries import LombScargle
+except ImportError:
+    from astropy.stats import LombScargle
+
+
+def _series(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    times = np.sort(rng.uniform(0, 8, n))
+    times[0], times[-1] = 0, 8
+    data = np.sin(2 * np.pi * 1.3 * times) + 0.1 * rng.normal(size=n)
+    return times, data
+
+
+def _reference(times, data, freqs):
+    """power of every non-zero frequency computed directly with astropy,
+    the zero frequency gets the minimum of its neighbors."""
+    lomb = LombScargle(times, data)
+    psd = np.empty(len(freqs))
+    non_zero = freqs != 0
+    psd[non_zero] = lomb.power(np.abs(freqs[non_zero]), method="slow")
+    for idx in np.flatnonzero(~non_zero):
+        left = psd[idx - 1] if idx > 0 else np.inf
+        right = psd[idx + 1] if idx < len(freqs) - 1 else np.inf
+        psd[idx] = min(left, right)
+    return psd
+
+
+def test_lomb_scargle_zero_split_regular_grid():
+    times, data = _series()
+    # df = 1 / 8 / 4, the zero frequency is the 9th sample
+    freqs = FrequencySamples(input_time=times, minimum_frequency=-0.25,
+                             maximum_frequency=2, samples_per_peak=4)
+    assert freqs._regular and freqs.zero_idx == 8
+
+    psd = freqs.lomb_scargle(times, data, method="slow")
+    np.testing.assert_allclose(psd.data, _reference(times, data, freqs.data))
+
+
+def test_lomb_scargle_zero_split_irregular_grid():
+    times, data = _series()
+    grid = np.array([-0.4, -0.31, -0.2, -0.05, 0, 0.02, 0.1, 0.13, 0.25])
+    freqs = FrequencySamples(grid)
+    assert not freqs._regular and freqs.zero_idx == 4
+
+    psd = freqs.lomb_scargle(times, data, method="slow")
+    np.testing.assert_allclose(psd.data, _reference(times, data, grid))
+
+
+def test_lomb_scargle_nifty_matches_astropy():
+    pytest.importorskip("nifty_ls")
+    times, data = _series()
+    freqs = FrequencySamples(input_time=times, minimum_frequency=0,
+                             maximum_frequency=2, samples_per_peak=4)
+
+    psd = freqs.lomb_scargle(times, data, package="nifty-ls")
+    expected = freqs.lomb_scargle(times, data, method="slow")
+    np.testing.assert_allclose(psd.data, expected.data, atol=1e-6)
+
+
+def test_lomb_scargle_nifty_irregular_grid():
+    pytest.importorskip("nifty_ls")
+    times, data = _series()
+    freqs = FrequencySamples(np.array([0.01, 0.05, 0.13, 0.2, 0.5]))
+
+    with pytest.raises(ValueError):
+        freqs.lomb_scargle(times, data, package="nifty-ls")
+
+    # evenly spaced grids given as values are accepted
+    regular = FrequencySamples(input_time=times, minimum_frequency=0,
+                               maximum_frequency=2, samples_per_peak=4)
+    for freqs in (FrequencySamples(np.linspace(0, 2, 200)), regular[10:50]):
+        assert not freqs._regular
+        psd = freqs.lomb_scargle(times, data, package="nifty-ls")
+        expected = freqs.lomb_scargle(times, data, method="slow")
+        np.testing.assert_allclose(psd.data, expected.data, atol=1e-6)
+
+
+def test_frequency_samples_setitem_drops_cache():
+    times, _ = _series()
+    freqs = FrequencySamples(input_time=times, minimum_frequency=0,
+                             maximum_frequency=2, samples_per_peak=4)
+    assert freqs.min() == 0 and freqs.has_zero
+
+    freqs[0:2] = Array([5., 6.])
+    assert not freqs._regular
+    assert freqs.min() == freqs.data[2] and freqs.max() == 6
+    assert not freqs.has_zero
+
+
+def test_lomb_scargle_float32_offset_times():
+    rng = np.random.default_rng(1)
+    times = 1.2e9 + np.sort(rng.uniform(0, 1000, 500))
+    data = np.sin(2 * np.pi * 0.05 * times) + 0.1 * rng.normal(size=500)
+    freqs = FrequencySamples(input_time=times, minimum_frequency=0.01,
+                             maximum_frequency=0.2, samples_per_peak=4)
+
+    psd64 = freqs.lomb_scargle(times, data)
+    psd32 = freqs.lomb_scargle(times, data, dtype=np.float32)
+    assert psd32.dtype == np.float32
+    np.testing.assert_allclose(psd32.data, psd64.data, atol=1e-3)
+    assert psd32.epoch == psd64.epoch == times.min()
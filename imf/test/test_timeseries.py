@@ -0,0 +1,47 @@
+import numpy as np
+
+from imf.types import TimeSamples, TimeSeries
+
+
+def test_closest_idx_matches_argmin():
+    values = np.array([0., 0.5, 1.25, 2., 2.75, 3., 4.5, 6.])
+    times = TimeSamples(initial_array=values, assume_sorted=True)
+    # exact ties between neighbors, the ends and beyond them
+    queries = np.concatenate([[-3., 0., 6., 10.],
+                              (values[1:] + values[:-1]) / 2,
+                              np.linspace(-1, 7, 57)])
+    for query in queries:
+        assert times.closest_idx(query) == np.abs(values - query).argmin()
+
+
+def test_closest_idx_unsorted():
+    values = np.array([3., 0., 2., 5., 1.])
+    times = TimeSamples(initial_array=values)
+    assert not times.is_sorted
+    for query in np.linspace(-1, 6, 29):
+        assert times.closest_idx(query) == np.abs(values - query).argmin()
+
+
+def test_sorted_state_follows_changes():
+    times = TimeSamples(n=10, delta=1., struct="regular")
+    assert times.is_sorted
+
+    times.roll(3)
+    assert not times.is_sorted
+    series = TimeSeries(np.arange(10.), times=times)
+    start, end = series.get_time_slice(1.0, 5.0).times.data[[0, -1]]
+    assert (start, end) == (1.0, 4.0)
+
+    times.replace(np.arange(10.))
+    assert times.is_sorted
+    times[0:2] = TimeSamples(initial_array=[5., 6.])
+    assert not times.is_sorted
+
+
+def test_sorted_state_of_irregular_struct():
+    np.random.seed(0)
+    # "slight" is dispatched first, the samples are left unsorted
+    times = TimeSamples(n=200, delta=0.01, struct="slight automix",
+                        sigma=5)
+    assert times.is_sorted == bool(np.all(np.diff(times.data) >= 0))
+    assert not times.is_sorted
@@ -0,0 +1,40 @@
+import numpy as np
+
+from imf.regressions.regressors import SGDRegression
+from imf.transform.transform import RegressionTransformer
+from imf.types import FrequencySamples, TimeSamples, TimeSeries
+
+
+def _series(times):
+    return TimeSeries(np.sin(2 * np.pi * 1.3 * times.data), times=times)
+
+
+def test_regression_transformer_dictionary_reuse():
+    times = TimeSamples(n=50, delta=0.1, struct="regular")
+    freqs = FrequencySamples(input_time=times, minimum_frequency=0,
+                             maximum_frequency=3, samples_per_peak=2)
+    tr = RegressionTransformer(SGDRegression(), freqs)
+
+    first = _series(times)
+    first.to_frequencyseries(tr)
+    phi = tr.reg.dict
+
+    # equal times in another object reuse the Dictionary and give its times
+    second = _series(TimeSamples(initial_array=times.data.copy()))
+    second.to_frequencyseries(tr)
+    assert tr.reg.dict is phi
+    assert tr.get_times() is second.times
+
+    # times changed in place
+    shifted = second.times
+    shifted += 1
+    second.to_frequencyseries(tr)
+    assert tr.reg.dict is not phi
+    np.testing.assert_array_equal(tr.reg.dict.time.data, times.data + 1)
+    phi = tr.reg.dict
+
+    # frequencies changed in place
+    freqs *= 2
+    second.to_frequencyseries(tr)
+    assert tr.reg.dict is not phi
+    np.testing.assert_array_equal(tr.reg.dict.frequency.data, freqs.data)
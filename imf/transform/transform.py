@@ -65,18 +65,47 @@ class RegressionTransformer(FourierTransformer):
         self.reg = reg
         self.freq = freq
         self.active = False
+        self._dict_key = None
 
     def _set(self, data):
         """
         inner method used to reset a Regression Object
         and create a new Dictionary to use with.
 
+        The Dictionary is the expensive part, so it is only computed
+        again when the TimeSamples of the data or the frequencies of this
+        Transformer differ from the ones used by the current Dictionary.
+
         :param data:        data to use in the Regression Object,
                             which will use the TimeSamples stored in
                             the data TimeSeries.
         """
         self.reg.reset()
-        self.reg.create_dict(data.times, self.freq)
+        if self._has_dict(data.times):
+            # the Dictionary gives the times of the last transformed data
+            self.reg.dict.rebind(data.times, self.freq)
+        else:
+            self.reg.create_dict(data.times, self.freq)
+            # the Dictionary keeps references to the samples, which may be
+            # changed in place, so their values are kept for the comparison
+            self._dict_key = (self.reg.dict, data.times.data.copy(),
+                              self.freq.data.copy())
+
+    def _has_dict(self, times):
+        """
+        check if the Regression Object already has a Dictionary
+        computed for the given times and the frequencies of
+        this Transformer.
+
+        :param times:       TimeSamples object.
+        :return:            True if the Dictionary can be reused.
+        """
+        if not self.reg.valid or self._dict_key is None:
+            return False
+        phi, dict_times, dict_freq = self._dict_key
+        return (self.reg.dict is phi
+                and np.array_equal(dict_times, times.data)
+                and np.array_equal(dict_freq, self.freq.data))
 
     def forward(self, data, **kwargs):
         self.reg.set_coef(data)
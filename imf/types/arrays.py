@@ -264,7 +264,7 @@ class Array(object):
             index = slice(index, index + 1)
 
         if isinstance(other, Array):
-            if self.kind is 'real' and other.kind is 'complex':
+            if self.kind == 'real' and other.kind == 'complex':
                 raise ValueError('Cannot set real value with complex')
 
             if isinstance(index, slice):
@@ -519,5 +519,25 @@ class Array(object):
         return self._return(copy_data)
 
     def add_point(self, point):
-        self._data = np.append(self._data, point)
+        """
+        append a point at the end of the array. The values are kept on a
+        buffer that doubles its capacity when full, so appending M points
+        costs O(M) instead of copying the whole array every time.
+
+        :param point: scalar value to append
+        """
+        size = len(self._data)
+        dtype = np.result_type(self.dtype, point)
+        buffer = getattr(self, "_buffer", None)
+        # the buffer is only valid while _data is still the view given by it
+        # and it can hold the new point without truncating it
+        if (buffer is None or self._data is not self._buffer_view
+                or size == len(buffer) or buffer.dtype != dtype):
+            buffer = np.empty(max(2 * size, 1), dtype=dtype)
+            buffer[:size] = self._data
+            self._buffer = buffer
+
+        buffer[size] = point
+        self._data = buffer[:size + 1]
+        self._buffer_view = self._data
 
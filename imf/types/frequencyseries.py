@@ -2,11 +2,51 @@
 Provides a class representing a frequency series.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+
 import numpy as np
 from imf.types.arrays import Array
-from astropy.stats import LombScargle
-import matplotlib.pyplot as plt
-import scipy.signal as signal
+
+# methods (and their extra arguments) used by lomb_scargle for every package
+_LOMB_SCARGLE_PACKAGES = {
+    "astropy": ("_astropy_lomb_scargle", {}),
+    "nifty-ls": ("_nifty_lomb_scargle", {"backend": "finufft"}),
+    "nifty-ls-cuda": ("_nifty_lomb_scargle", {"backend": "cufinufft"}),
+    "cusignal": ("_cusignal_lomb_scargle", {}),
+}
+
+
+@lru_cache(maxsize=32)
+def _tukey(n, alpha):
+    """
+    tukey window of length n, cached since the segments of a Lomb-Welch
+    periodogram (and the series of a matched filter pipeline) usually share
+    the same length. The returned array is read-only.
+
+    :param n:       length of the window
+    :param alpha:   fraction of the window inside the cosine tapered region
+    :return:        array with the window values
+    """
+    import scipy.signal as signal
+
+    window = signal.windows.tukey(n, alpha=alpha)
+    window.flags.writeable = False
+    return window
+
+
+@lru_cache(maxsize=32)
+def _tukey_weight(n, alpha):
+    """
+    mean squared value of the tukey window of length n, used to correct
+    the power lost by windowing the data.
+
+    :param n:       length of the window
+    :param alpha:   fraction of the window inside the cosine tapered region
+    :return:        scalar weight of the window
+    """
+    window = _tukey(n, alpha)
+    return float((window ** 2).sum() / n)
 
 
 class FrequencySamples(Array):
@@ -30,7 +70,12 @@ class FrequencySamples(Array):
                                     value used for estimation of maximum freq.
         :param n_samples:           integer
                                     number of frequencies to compute.
+
+        A grid created from its parameters is only kept as
+        (minimum_frequency, df, n_samples), the frequency values are
+        computed the first time they are needed.
         """
+        base_params = None
         if initial_array is None:
             if not isinstance(input_time, (np.ndarray, list, Array)):
                 raise ValueError("input_time must be an Array or array-like")
@@ -57,12 +102,13 @@ class FrequencySamples(Array):
                 freq_duration = maximum_frequency - minimum_frequency
                 n_samples = 1 + int(round(freq_duration / df))
 
-            initial_array = minimum_frequency + df * np.arange(n_samples)
+            base_params = (minimum_frequency, df, n_samples)
         else:
             if isinstance(initial_array, FrequencySamples):
                 df = initial_array.basic_df
                 samples_per_peak = initial_array.samples_per_peak
-                initial_array = initial_array.data
+                base_params = initial_array._base_params
+                initial_array = initial_array._grid
             else:
                 if df is None:
                     df = initial_array[1] - initial_array[0]
@@ -71,7 +117,80 @@ class FrequencySamples(Array):
 
         self._df = df
         self._n_per_peak = samples_per_peak
-        super().__init__(initial_array)
+        if initial_array is None:
+            self._grid = None
+        else:
+            super().__init__(initial_array)
+        self._base_params = base_params
+
+    @property
+    def _data(self):
+        if self._grid is None:
+            minimum_frequency, df, n_samples = self._base_params
+            self._grid = minimum_frequency + df * np.arange(n_samples)
+        return self._grid
+
+    @_data.setter
+    def _data(self, value):
+        """
+        every change of the frequency values goes through here (including
+        in-place operations of Array) or through __setitem__, so the cached
+        values are dropped and the grid is no longer assumed to be regular.
+        """
+        self._grid = value
+        self._drop_cache()
+
+    def __setitem__(self, index, other):
+        super().__setitem__(index, other)
+        self._drop_cache()
+
+    def _drop_cache(self):
+        self._base_params = None
+        self.__dict__.pop("zero_idx", None)
+        self.__dict__.pop("_limits", None)
+
+    @property
+    def _regular(self):
+        return self._base_params is not None
+
+    def _evenly_spaced(self):
+        """
+        :return: True if the frequencies have a constant step, which is
+                 known without checking for grids created from parameters.
+        """
+        if self._regular or len(self) < 3:
+            return True
+        steps = np.diff(self._grid)
+        return bool(np.allclose(steps, steps[0], rtol=1e-6, atol=0))
+
+    def __len__(self):
+        if self._grid is None:
+            return self._base_params[2]
+        return len(self._grid)
+
+    @cached_property
+    def _limits(self):
+        if self._base_params is not None:
+            minimum_frequency, df, n_samples = self._base_params
+            return (np.float64(minimum_frequency),
+                    np.float64(minimum_frequency + df * (n_samples - 1)))
+        return self._grid.min(), self._grid.max()
+
+    def min(self):
+        """
+        Return the minimum frequency, computed once.
+
+        :return:
+        """
+        return self._limits[0]
+
+    def max(self):
+        """
+        Return the maximum frequency, computed once.
+
+        :return:
+        """
+        return self._limits[1]
 
     def check_nsst(self, B):
         """
@@ -104,15 +223,20 @@ class FrequencySamples(Array):
 
     @property
     def has_zero(self):
-        return 0 in self._data
+        return self.zero_idx is not None
 
-    @property
+    @cached_property
     def zero_idx(self):
-        if self.has_zero:
-            return np.where(self._data == 0)[0][0]
-        else:
+        if self._base_params is not None:
+            minimum_frequency, df, n_samples = self._base_params
+            idx = int(round(-minimum_frequency / df))
+            if 0 <= idx < n_samples and minimum_frequency + df * idx == 0:
+                return idx
             return None
 
+        zeros = np.flatnonzero(self._data == 0)
+        return zeros[0] if len(zeros) > 0 else None
+
     @property
     def df(self):
         return self._df
@@ -125,50 +249,194 @@ class FrequencySamples(Array):
     def basic_df(self):
         return self._df * self._n_per_peak
 
-    def lomb_scargle(self, times, data, package="astropy", norm="standard", weighted=False, windowed=False):
+    def lomb_scargle(self, times, data, package="astropy", norm="standard", weighted=False, windowed=False,
+                     method="auto", dtype=np.float64):
         """
-        compute the Lomb-Scargle periodogram using astropy package.
+        compute the Lomb-Scargle periodogram using astropy package, the
+        NUFFT based implementation of nifty-ls or the GPU implementation
+        of cuSignal.
 
         :param times:
         :param data:
-        :param package:
+        :param package:     "astropy", "nifty-ls", "nifty-ls-cuda" (the
+                            GPU backend of nifty-ls) or "cusignal"
         :param norm:
+        :param method:      method used by astropy ('auto', 'fast', 'cython',
+                            'slow', ...), ignored by the other packages
+        :param dtype:       floating type used for the computation and the
+                            resulting FrequencySeries, np.float32 halves the
+                            memory traffic for long series. The times are
+                            shifted to start at zero before the cast, so
+                            absolute timestamps don't lose their precision
         """
-        if package is "astropy":
-            lomb = LombScargle(times, data)
-        else:
-            raise ValueError("for now we only use astropy package to compute"
-                             "lomb-scargle periodogram")
-        window = 1
+        try:
+            name, kwargs = _LOMB_SCARGLE_PACKAGES[package]
+        except KeyError:
+            raise ValueError("lomb-scargle periodogram can only be computed "
+                             "with 'astropy', 'nifty-ls', 'nifty-ls-cuda' "
+                             "or 'cusignal'")
+        if isinstance(times, Array):
+            times = times.data
+        times = np.asarray(times, dtype=np.float64)
+        # the periodogram doesn't change under a time shift, starting the
+        # times at zero keeps them accurate after the cast to dtype
+        epoch = times.min()
+        times = (times - epoch).astype(dtype, copy=False)
+        data = np.asarray(data, dtype=dtype)
         W = 1
         if windowed:
-            window = signal.windows.tukey(len(data), alpha=1. / 8)
-        data *= window
-        if windowed and weighted:
-            W = (window ** 2).sum() / len(window)
+            # windowed copy, the caller's data must not be modified
+            data = data * _tukey(len(data), 1. / 8).astype(dtype, copy=False)
+            if weighted:
+                W = _tukey_weight(len(data), 1. / 8)
+
+        if package == "astropy":
+            kwargs = dict(kwargs, method=method)
+        psd = getattr(self, name)(times, data, norm, **kwargs)
+
+        # psd[psd < 0] = 0.000001
+
+        return FrequencySeries(psd / W, frequency_grid=self, epoch=epoch,
+                               dtype=dtype)
+
+    def _fill_zero_frequency(self, psd):
+        """
+        the periodogram is not defined on the zero frequency, give it the
+        minimum power of its neighbors.
+
+        :param psd:         array with the power on every frequency
+        """
+        zero_idx = self.zero_idx
+        if zero_idx is None or len(psd) < 2:
+            return
+        left = psd[zero_idx - 1] if zero_idx > 0 else np.inf
+        right = psd[zero_idx + 1] if zero_idx < len(psd) - 1 else np.inf
+        psd[zero_idx] = min(left, right)
+
+    def _astropy_lomb_scargle(self, times, data, norm, method="auto"):
+        """
+        compute the Lomb-Scargle periodogram with astropy.
+
+        The power is symmetric in the frequency, so when a regular grid
+        contains the zero frequency both of its sides are computed with a
+        single call over the longest one. The sides of an irregular grid are
+        not mirror images, each one is computed with its own call.
+
+        A grid created from its parameters is known to be regular, so
+        astropy doesn't need to check it before using its fast method.
+
+        :param times:       times of the data
+        :param data:        (windowed) data values
+        :param norm:        normalization of the periodogram
+        :param method:      method used by astropy
+        :return:            array with the power on every frequency
+        """
+        try:
+            from astropy.timeseries import LombScargle
+        except ImportError:
+            # astropy < 3.2
+            from astropy.stats import LombScargle
+
+        lomb = LombScargle(times, data)
+        regular = self._regular and (self.has_zero or self.min() >= 0)
+        grid = self._data.astype(data.dtype, copy=False)
 
-        if self.has_zero:
+        if self.has_zero and self._regular:
             zero_idx = self.zero_idx
-            psd = np.zeros(len(self._data))
-            if zero_idx == 0:
-                psd[1:] = lomb.power(self._data[1:])
-                psd[0] = min(psd[1:])
+            n_right = len(grid) - zero_idx - 1
+            if n_right >= zero_idx:
+                side = grid[zero_idx + 1:]
             else:
-                neg_freq, pos_freq = self.split_by_zero()
-                right_psd = lomb.power(pos_freq)
-                left_psd = lomb.power(np.abs(neg_freq[::-1]))
-                psd[:zero_idx] = left_psd[::-1]
-                psd[zero_idx] = min(psd[:zero_idx])
-                psd[zero_idx+1:] = right_psd
+                side = -grid[zero_idx - 1::-1]
+            power = lomb.power(side, normalization=norm, method=method,
+                               assume_regular_frequency=regular)
+            psd = np.empty(len(grid), dtype=power.dtype)
+            psd[zero_idx + 1:] = power[:n_right]
+            psd[:zero_idx] = power[:zero_idx][::-1]
+            self._fill_zero_frequency(psd)
+        elif self.has_zero:
+            zero_idx = self.zero_idx
+            psd = np.empty(len(grid), dtype=data.dtype)
+            if zero_idx + 1 < len(grid):
+                psd[zero_idx + 1:] = lomb.power(grid[zero_idx + 1:],
+                                                normalization=norm,
+                                                method=method)
+            if zero_idx > 0:
+                psd[:zero_idx] = lomb.power(np.abs(grid[:zero_idx]),
+                                            normalization=norm,
+                                            method=method)
+            self._fill_zero_frequency(psd)
         else:
-            psd = lomb.power(np.abs(self._data), normalization=norm)
+            psd = lomb.power(np.abs(grid), normalization=norm,
+                             method=method, assume_regular_frequency=regular)
+        return psd
 
-        # psd[psd < 0] = 0.000001
+    def _nifty_lomb_scargle(self, times, data, norm, backend):
+        """
+        compute the Lomb-Scargle periodogram over the whole frequency grid
+        with a single type-1 NUFFT call of nifty-ls, which evaluates Nf evenly
+        spaced frequencies, so the grid must have a constant step.
+
+        :param times:       times of the data
+        :param data:        (windowed) data values
+        :param norm:        normalization of the periodogram
+        :param backend:     nifty-ls backend, "finufft" or "cufinufft"
+        :return:            array with the power on every frequency
+        """
+        import nifty_ls
+
+        if self.min() < 0:
+            raise ValueError("nifty-ls only compute the periodogram over "
+                             "non-negative frequency grids")
+        if not self._evenly_spaced():
+            raise ValueError("nifty-ls only compute the periodogram over "
+                             "evenly spaced frequency grids")
+
+        psd = nifty_ls.lombscargle(times, data,
+                                   fmin=self.min(), fmax=self.max(),
+                                   Nf=len(self), normalization=norm,
+                                   backend=backend).power
+        self._fill_zero_frequency(psd)
+        return psd
 
-        return FrequencySeries(psd / W, frequency_grid=self, epoch=times.min())
+    def _cusignal_lomb_scargle(self, times, data, norm):
+        """
+        compute the Lomb-Scargle periodogram on the GPU with cuSignal, where
+        every frequency is evaluated in parallel.
+
+        cuSignal follows scipy conventions, it uses angular frequencies and
+        its normalized power centers the data once and fits no mean at each
+        frequency. That is astropy 'standard' with fit_mean=False, so it
+        differs slightly from the astropy package, which floats the mean.
+        Other normalizations are not available. The zero frequency is not
+        computed, it is filled with the same rule used for astropy.
+
+        :param times:       times of the data
+        :param data:        (windowed) data values
+        :param norm:        normalization of the periodogram
+        :return:            array with the power on every frequency
+        """
+        import cupy as cp
+        import cusignal
+
+        if norm != "standard":
+            raise ValueError("cusignal only compute the 'standard' "
+                             "normalization of the periodogram, without "
+                             "a floating mean")
+
+        non_zero = self._data != 0
+        angular_freqs = 2 * np.pi * np.abs(self._data[non_zero])
+        power = cusignal.lombscargle(cp.asarray(times), cp.asarray(data),
+                                     cp.asarray(angular_freqs,
+                                                dtype=data.dtype),
+                                     precenter=True, normalize=True)
+        psd = np.zeros(len(self._data), dtype=data.dtype)
+        psd[non_zero] = cp.asnumpy(power)
+        self._fill_zero_frequency(psd)
+        return psd
 
     def lomb_welch(self, times, data, data_per_segment, over,
-                   norm='standard', weighted=True, windowed=True):
+                   norm='standard', weighted=True, windowed=True, n_jobs=None):
         """
         compute the Lomb-Scargle average periodogram usign welch computation,
         this method is not developed yet, idea comes from paper:
@@ -177,6 +445,9 @@ class FrequencySamples(Array):
         Non-uniform Sampling", IEEE-EMBS, 26th annual International conference,
         Sep 2004.
 
+        The periodograms of the segments are independent, they are computed
+        in parallel by a pool of threads.
+
         :param over:
         :param data_per_segment:
         :param norm:
@@ -184,38 +455,33 @@ class FrequencySamples(Array):
         :param windowed:
         :param times:
         :param data:
+        :param n_jobs:      number of threads used for the segments, None
+                            uses the default of ThreadPoolExecutor
         """
         # import pdb
         # pdb.set_trace()
+        def segment_psd(start_time, end_time):
+            aux_timeseries = data.get_time_slice(start_time, end_time)
+            W = 1
+            if windowed:
+                aux_timeseries *= _tukey(len(aux_timeseries), 1. / 8)
+                if weighted:
+                    W = _tukey_weight(len(aux_timeseries), 1. / 8)
+            return aux_timeseries.psd(self, norm=norm) / W
+
+        starts = range(0, len(data) - data_per_segment,
+                       int(data_per_segment * over))
+        start_times = [times[n] for n in starts]
+        end_times = [times[n + data_per_segment] for n in starts]
+        start_times.append(times[len(times) - data_per_segment - 1])
+        end_times.append(times[len(times) - 1])
+
         psd = FrequencySeries(np.zeros(len(self)), frequency_grid=self,
                               epoch=data.epoch)
-
-        counter = 0
-        n = 0
-        W = 1
-        window = 1
-        while n < len(data) - data_per_segment:
-            aux_timeseries = data.get_time_slice(times[n],
-                                                 times[n + data_per_segment])
-            if windowed:
-                window = signal.windows.tukey(len(aux_timeseries), alpha=1. / 8)
-            aux_timeseries *= window
-            if weighted and windowed:
-                W = (window ** 2).sum() / len(window)
-            psd += (aux_timeseries.psd(self, norm=norm) / W)
-            n += int(data_per_segment * over)
-            counter += 1
-
-        aux_timeseries = data.get_time_slice(
-            times[len(times) - data_per_segment - 1], times[len(times) - 1])
-        if windowed:
-            window = signal.windows.tukey(len(aux_timeseries), alpha=1. / 8)
-        aux_timeseries *= window
-        if weighted and windowed:
-            W = (window ** 2).sum() / len(window)
-        psd += (aux_timeseries.psd(self, norm=norm) / W)
-        counter += 1
-        psd /= counter
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            for segment in executor.map(segment_psd, start_times, end_times):
+                psd += segment
+        psd /= len(start_times)
         return psd
 
 
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from imf.types.arrays import Array
 from imf.types.frequencyseries import FrequencySamples, FrequencySeries
 from imf.transform.transform import FourierTransformer
@@ -7,7 +6,7 @@ from imf.transform.transform import FourierTransformer
 
 class TimeSamples(Array):
     def __init__(self, initial_array=None, n=None, delta=None,
-                 struct="slight", clear=True, **kwargs):
+                 struct="slight", clear=True, assume_sorted=False, **kwargs):
         """
         Time Samples Class,
             Allow creation fo time samples array which contains the
@@ -35,8 +34,11 @@ class TimeSamples(Array):
                                     - automix: is 'slightly' + 'outlier' + 'change' on
                                                 random positions.
         :param clear: True to create a new time samples. False to modify the previously one.
+        :param assume_sorted: True if the given time samples are known to be
+                              monotonically increasing.
         :param kwargs: additional paramters for the creation of time samples
         """
+        sorted_ = True if assume_sorted else None
         if initial_array is None:
             if delta <= 0:
                 raise ValueError("need to receive a valid delta of times")
@@ -44,15 +46,36 @@ class TimeSamples(Array):
             if "regular" in struct:
                 offset = kwargs.get("offset", 0)
                 initial_array = offset + np.arange(n) * delta
+                sorted_ = True
             else:
                 arr = IrregularTimeSamples(n, delta)
                 initial_array = arr.compute(struct=struct, clear=clear, **kwargs)
 
         else:
             if isinstance(initial_array, TimeSamples):
+                sorted_ = sorted_ or initial_array._sorted
                 initial_array = initial_array.data
 
         super().__init__(initial_array)
+        self._sorted = sorted_
+
+    @property
+    def _data(self):
+        return self._values
+
+    @_data.setter
+    def _data(self, value):
+        """
+        every change of the time values goes through here (including
+        in-place operations, roll, replace, ...), so the sorted state is
+        checked again when it is needed.
+        """
+        self._values = value
+        self._sorted = None
+
+    def __setitem__(self, index, other):
+        super().__setitem__(index, other)
+        self._sorted = None
 
     @property
     def average_fs(self):
@@ -68,6 +91,34 @@ class TimeSamples(Array):
         """
         return self._data.max() - self._data.min()
 
+    @property
+    def is_sorted(self):
+        """
+        :return: True if the time samples are monotonically increasing,
+                 the check is done only once if it wasn't given on creation.
+        """
+        if self._sorted is None:
+            self._sorted = bool(np.all(self._data[1:] >= self._data[:-1]))
+        return self._sorted
+
+    def closest_idx(self, time):
+        """
+        give the index of the time sample closest to the given time, using
+        a binary search when the time samples are sorted.
+
+        :param time: time value to look for
+        :return: the index of the closest time sample
+        """
+        if not self.is_sorted:
+            return np.abs(self._data - time).argmin()
+
+        idx = np.searchsorted(self._data, time)
+        if idx == len(self._data):
+            return idx - 1
+        if idx > 0 and time - self._data[idx - 1] <= self._data[idx] - time:
+            return idx - 1
+        return idx
+
     def shifted(self, shift_by):
         """
         shift the time interval by specific value.
@@ -88,6 +139,45 @@ class TimeSamples(Array):
         """
         return TimeSamples(ary)
 
+    def add_point(self, point):
+        """
+        append a time sample, a sample earlier than the last one breaks
+        the sorted state of the time samples.
+
+        :param point: time to append
+        """
+        sorted_ = self._sorted
+        if sorted_ and len(self._data) > 0 and point < self._data[-1]:
+            sorted_ = False
+        super().add_point(point)
+        self._sorted = sorted_
+
+    @classmethod
+    def _from_slice(cls, ary, assume_sorted=None):
+        """
+        wrap a slice of existing time samples skipping the validation and
+        copy done in the constructor, the result shares memory with 'ary'.
+
+        :param ary:             numpy array with the sliced time samples
+        :param assume_sorted:   sorted state of the original time samples
+        :return: TimeSamples
+        """
+        times = cls.__new__(cls)
+        times._data = ary
+        times._sorted = assume_sorted
+        return times
+
+    def _getslice(self, index):
+        """
+        a slice of sorted time samples is still sorted. The slice is a copy
+        since callers may shift it in place.
+
+        :param index:
+        :return:
+        """
+        return TimeSamples._from_slice(self._data[index].copy(),
+                                       assume_sorted=self._sorted)
+
 
 class IrregularTimeSamples(object):
     def __init__(self, n: int, dt: float, grid: np.ndarray=None):
@@ -108,7 +198,8 @@ class IrregularTimeSamples(object):
             raise ValueError("'dt' need to be positive and non zero")
 
         if grid is None:
-            grid = np.arange(n) * dt
+            # float grid, the irregularities are added in place
+            grid = np.arange(n) * float(dt)
 
         if n != len(grid):
             raise ValueError("the 'grid' used need to be of length 'n'")
@@ -133,7 +224,7 @@ class IrregularTimeSamples(object):
         """
         kwargs = self._set_kwargs(kwargs)
         if clear:
-            self.t = np.arange(self.n) * self.dt
+            self.t = np.arange(self.n) * float(self.dt)
 
         if "slight" in struct:
             self._base(**kwargs)
@@ -179,8 +270,7 @@ class IrregularTimeSamples(object):
 
         :param kwargs:
         """
-        for i in range(self.n):
-            self.t[i] += kwargs.get("epsilon")[i]
+        self.t += kwargs.get("epsilon")[:self.n]
 
     def _normalize(self, offset=0):
         """
@@ -237,12 +327,13 @@ class IrregularTimeSamples(object):
         gamma = np.random.choice([0.5, 1, 1.5, 2])
         offset = np.random.uniform(0, self.n * self.dt)
         empty_window = np.random.uniform(0, self.n * self.dt * 0.5)
+        epsilon = np.random.normal(0, 0.05 * self.dt, self.n)
+        # the gap is folded into the irregularities so the time samples
+        # are only traversed once by the additions
+        epsilon[3 * (self.n // 5):] += empty_window
         self.t.sort()
         self.t[2 * (self.n // 5):4 * (self.n // 5)] *= gamma
-        self.t[3 * (self.n // 5):] += empty_window
-        self._add_irregularities(epsilon=np.random.normal(0,
-                                                          0.05 * self.dt,
-                                                          self.n))
+        self._add_irregularities(epsilon=epsilon)
         self.t.sort()
         self._normalize(offset=offset)
 
@@ -285,6 +376,8 @@ class TimeSeries(Array):
 
         super().__init__(initial_array, dtype=dtype)
         self._times = times
+        # the given time samples may be shared with other time series
+        self._own_times = False
 
     def __eq__(self, other):
         """
@@ -320,11 +413,11 @@ class TimeSeries(Array):
 
     def _getslice(self, index):
         return self._return(self._data[index],
-                            times=TimeSamples(initial_array=self._times[index]))
+                            times=self._times._getslice(index))
 
     def get_time_slice(self, start_time, end_time):
-        start_idx = np.abs(self._times - start_time).argmin()
-        end_idx = np.abs(self._times - end_time).argmin()
+        start_idx = self._times.closest_idx(start_time)
+        end_idx = self._times.closest_idx(end_time)
         return self._getslice(slice(start_idx, end_idx))
 
     def _return(self, ary, **kwargs):
@@ -335,6 +428,21 @@ class TimeSeries(Array):
         self._data = np.delete(self._data,idxs)
         self._times = TimeSamples(initial_array=np.delete(self._times, idxs))
 
+    def add_data(self, point_data, point_time):
+        """
+        append a new observation at the end of the time series. The time
+        samples are copied before the first append, so other time series
+        sharing them are not modified.
+
+        :param point_data: value of the observation
+        :param point_time: time of the observation
+        """
+        if not self._own_times:
+            self._times = self._times[:]
+            self._own_times = True
+        self.add_point(point_data)
+        self._times.add_point(point_time)
+
     def psd(self, frequency_grid: FrequencySamples, norm='standard'):
         """
         calculate the power spectral density of this time series.
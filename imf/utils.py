@@ -1,5 +1,6 @@
 import numpy as np
 from scipy import signal
+from imf.types.arrays import Array
 
 
 def get_frequency(times, samples_per_peak=5,
@@ -7,7 +8,8 @@ def get_frequency(times, samples_per_peak=5,
                   maximum_frequency=None,
                   return_freq_limits=False):
     # pdb.set_trace()
-    baseline = max(times) - min(times)
+    times = times.data if isinstance(times, Array) else np.asarray(times)
+    baseline = times.max() - times.min()
     n_samples = len(times)
 
     df = 1 / (baseline * samples_per_peak)